@@ -1,17 +1,21 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import contextlib
+import logging
 import signal
 import socket
 from typing import Any
 
 import socketio
 
-from repowire.config.models import Config, load_config
+from repowire.config.models import Config, LoggingConfig, load_config
+from repowire.protocol import codec
 from repowire.protocol.messages import Message, MessageType
 from repowire.session.manager import TmuxSessionManager
 
+logger = logging.getLogger(__name__)
+
 
 class RepowireDaemon:
     def __init__(self, config: Config | None = None) -> None:
@@ -24,11 +28,26 @@ class RepowireDaemon:
         self._pending_relayed: dict[str, asyncio.Future[str]] = {}
 
     async def start(self) -> None:
-        await self.session_manager.start()
+        # Start the relay handshake first so its network round trips overlap local startup.
+        relay_task: asyncio.Task[None] | None = None
+        if self.config.relay.enabled and self.config.relay.api_key:
+            relay_task = asyncio.create_task(self._connect_relay())
+
+        try:
+            await self.session_manager.start()
+        except BaseException:
+            # Don't leave the relay connection and its reconnect loop running.
+            if relay_task is not None:
+                relay_task.cancel()
+                with contextlib.suppress(BaseException):
+                    await relay_task
+                if self._sio and self._sio.connected:
+                    await self._sio.disconnect()
+            raise
         self._running = True
 
-        if self.config.relay.enabled and self.config.relay.api_key:
-            await self._connect_relay()
+        if relay_task is not None:
+            await relay_task
 
         await self._run_forever()
 
@@ -45,6 +64,7 @@ class RepowireDaemon:
             reconnection=True,
             reconnection_delay=1,
             reconnection_delay_max=30,
+            json=codec,
         )
 
         self._register_relay_handlers()
@@ -57,18 +77,23 @@ class RepowireDaemon:
                 wait_timeout=10,
             )
 
-            for name, peer_config in self.config.peers.items():
-                await self._sio.emit(
-                    "register",
-                    {
-                        "name": name,
-                        "path": peer_config.path,
-                        "machine": self.machine,
-                    },
+            # No ack callback is requested, so the emits only queue packets; send them together.
+            await asyncio.gather(
+                *(
+                    self._sio.emit(
+                        "register",
+                        {
+                            "name": name,
+                            "path": peer_config.path,
+                            "machine": self.machine,
+                        },
+                    )
+                    for name, peer_config in self.config.peers.items()
                 )
+            )
 
         except Exception as e:
-            print(f"Failed to connect to relay: {e}")
+            logger.warning("Failed to connect to relay: %s", e)
 
     def _register_relay_handlers(self) -> None:
         if not self._sio:
@@ -76,11 +101,11 @@ class RepowireDaemon:
 
         @self._sio.on("connect")
         async def on_connect() -> None:
-            print(f"Connected to relay: {self.config.relay.url}")
+            logger.info("Connected to relay: %s", self.config.relay.url)
 
         @self._sio.on("disconnect")
         async def on_disconnect() -> None:
-            print("Disconnected from relay")
+            logger.info("Disconnected from relay")
 
         @self._sio.on("message")
         async def on_message(data: dict[str, Any]) -> None:
@@ -88,20 +113,20 @@ class RepowireDaemon:
 
         @self._sio.on("peer_joined")
         async def on_peer_joined(data: dict[str, Any]) -> None:
-            print(f"Peer joined: {data.get('name')}")
+            logger.info("Peer joined: %s", data.get("name"))
 
         @self._sio.on("peer_left")
         async def on_peer_left(data: dict[str, Any]) -> None:
-            print(f"Peer left: {data.get('name')}")
+            logger.info("Peer left: %s", data.get("name"))
 
     async def _handle_relay_message(self, data: dict[str, Any]) -> None:
-        msg = Message.from_dict(data)
-
-        if not msg.to_peer or msg.to_peer not in self.config.peers:
+        # Check the target before paying for a full model parse of frames meant for other peers.
+        to_peer = data.get("to_peer")
+        if to_peer not in self.config.peers:
             return
 
+        msg = Message.from_dict(data)
         from_peer = msg.from_peer
-        to_peer = msg.to_peer
         text = msg.payload.get("text", "")
         correlation_id = msg.correlation_id
 
@@ -133,7 +158,7 @@ class RepowireDaemon:
             try:
                 await self.session_manager.send_notification(to_peer, text, from_peer=from_peer)
             except Exception:
-                pass
+                logger.debug("Failed to deliver notification to %s", to_peer, exc_info=True)
 
     async def _run_forever(self) -> None:
         stop_event = asyncio.Event()
@@ -145,12 +170,21 @@ class RepowireDaemon:
         for sig in (signal.SIGINT, signal.SIGTERM):
             loop.add_signal_handler(sig, handle_signal)
 
-        print(f"Repowire daemon started (peers: {list(self.config.peers.keys())})")
+        logger.info("Repowire daemon started (peers: %s)", list(self.config.peers))
 
         await stop_event.wait()
         await self.stop()
 
 
+def _configure_logging(config: LoggingConfig) -> None:
+    logging.basicConfig(
+        level=config.level.upper(),
+        filename=config.file,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+
+
 async def run_daemon(config: Config | None = None) -> None:
     daemon = RepowireDaemon(config)
+    _configure_logging(daemon.config.logging)
     await daemon.start()
@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Any
 
 import yaml
 from pydantic import BaseModel, Field
@@ -71,7 +70,10 @@ class Config(BaseModel):
 
     def add_peer(self, name: str, tmux_session: str, path: str) -> None:
         """Add a peer to configuration."""
-        self.peers[name] = PeerConfig(tmux_session=tmux_session, path=path)
+        peer = PeerConfig(tmux_session=tmux_session, path=path)
+        if self.peers.get(name) == peer:
+            return
+        self.peers[name] = peer
         self.save()
 
     def remove_peer(self, name: str) -> bool:
@@ -56,9 +56,11 @@ def install_hooks() -> bool:
             }
         ]
     }
-    settings["hooks"]["Stop"] = [hook_config]
+    # Re-installing is common; leave Claude's settings file untouched if already current.
+    if settings["hooks"].get("Stop") != [hook_config]:
+        settings["hooks"]["Stop"] = [hook_config]
+        _save_claude_settings(settings)
 
-    _save_claude_settings(settings)
     return True
 
 
@@ -2,43 +2,67 @@
 from __future__ import annotations
 
 import json
+import os
 import socket
 import sys
+from collections.abc import Iterator
 from pathlib import Path
+from typing import BinaryIO
 
 SOCKET_PATH = "/tmp/repowire.sock"
 PENDING_DIR = Path.home() / ".repowire" / "pending"
+CHUNK_SIZE = 64 * 1024
+
+
+def _iter_lines_reversed(f: BinaryIO) -> Iterator[bytes]:
+    position = f.seek(0, os.SEEK_END)
+    pieces: list[bytes] = []
+    while position > 0:
+        read_size = min(CHUNK_SIZE, position)
+        position -= read_size
+        f.seek(position)
+        chunk = f.read(read_size)
+        end = len(chunk)
+        newline = chunk.rfind(b"\n", 0, end)
+        while newline != -1:
+            pieces.append(chunk[newline + 1 : end])
+            yield b"".join(reversed(pieces))
+            pieces.clear()
+            end = newline
+            newline = chunk.rfind(b"\n", 0, end)
+        pieces.append(chunk[:end])
+    yield b"".join(reversed(pieces))
 
 
 def extract_last_assistant_response(transcript_path: Path) -> str | None:
     if not transcript_path.exists():
         return None
 
-    last_response = None
-    with open(transcript_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+    # Scan from the end so only the final assistant entry is decoded.
+    with open(transcript_path, "rb") as f:
+        for line in _iter_lines_reversed(f):
+            if b'"assistant"' not in line:
                 continue
             try:
                 entry = json.loads(line)
-                if entry.get("type") == "assistant":
-                    message = entry.get("message", {})
-                    content = message.get("content", [])
-                    if isinstance(content, list):
-                        texts = [
-                            c.get("text", "")
-                            for c in content
-                            if isinstance(c, dict) and c.get("type") == "text"
-                        ]
-                        if texts:
-                            last_response = " ".join(texts)
-                    elif isinstance(content, str):
-                        last_response = content
-            except json.JSONDecodeError:
+            except ValueError:
                 continue
-
-    return last_response
+            if entry.get("type") != "assistant":
+                continue
+            message = entry.get("message", {})
+            content = message.get("content", [])
+            if isinstance(content, list):
+                texts = [
+                    c["text"]
+                    for c in content
+                    if isinstance(c, dict) and c.get("type") == "text" and "text" in c
+                ]
+                if texts:
+                    return " ".join(texts)
+            elif isinstance(content, str):
+                return content
+
+    return None
 
 
 def send_to_session_manager(correlation_id: str, response: str) -> bool:
@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import asyncio
-
 from mcp.server.fastmcp import FastMCP
 
 from repowire.session.manager import TmuxSessionManager
@@ -65,8 +63,7 @@ def create_mcp_server() -> FastMCP:
         Returns:
             Confirmation message
         """
-        await manager.broadcast(message)
-        peers = [p.name for p in manager.list_peers() if p.status.value == "online"]
+        peers = await manager.broadcast(message)
         return f"Broadcast sent to: {', '.join(peers) if peers else 'no peers online'}"
 
     @mcp.tool()
@@ -0,0 +1,34 @@
+"""JSON encoding for wire and on-disk payloads.
+
+Uses orjson when it is installed (``pip install repowire[fast]``) and falls back
+to the standard library otherwise. The module can be passed directly as the
+``json`` argument of python-socketio clients and servers.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed extras
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize to compact JSON text.
+
+    Keyword arguments are accepted for compatibility with ``json.dumps`` callers
+    such as python-socketio, which only ask for compact separators.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def loads(data: str | bytes, **kwargs: Any) -> Any:
+    """Parse JSON from text or UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
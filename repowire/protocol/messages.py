@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import secrets
 from datetime import datetime
 from enum import Enum
 from typing import Any
-from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
 
+def new_message_id() -> str:
+    """Generate a random 128-bit hex identifier for messages and correlation IDs."""
+    return secrets.token_hex(16)
+
+
 class MessageType(str, Enum):
     """Type of message in the mesh."""
 
@@ -22,7 +27,7 @@ class MessageType(str, Enum):
 class Message(BaseModel):
     """Base message in the Repowire mesh."""
 
-    id: str = Field(default_factory=lambda: str(uuid4()), description="Unique message ID")
+    id: str = Field(default_factory=new_message_id, description="Unique message ID")
     type: MessageType = Field(..., description="Message type")
     from_peer: str = Field(..., description="Sender peer name")
     to_peer: str | None = Field(None, description="Target peer name (None for broadcast)")
@@ -57,7 +62,7 @@ class QueryMessage(Message):
     """A query message that expects a response."""
 
     type: MessageType = Field(default=MessageType.QUERY)
-    correlation_id: str = Field(default_factory=lambda: str(uuid4()))
+    correlation_id: str = Field(default_factory=new_message_id)
 
     @classmethod
     def create(cls, from_peer: str, to_peer: str, text: str) -> QueryMessage:
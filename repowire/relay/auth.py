@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import json
 import secrets
 from pathlib import Path
 from datetime import datetime
@@ -10,6 +9,8 @@ from typing import Any
 
 from pydantic import BaseModel, Field
 
+from repowire.protocol import codec
+
 
 API_KEYS_PATH = Path.home() / ".repowire" / "api_keys.json"
 API_KEY_PREFIX = "rw_"
@@ -26,15 +27,35 @@ class APIKey(BaseModel):
     last_used: datetime | None = Field(default=None)
 
 
+# Parsed key store, reused while the file's path, mtime and size are unchanged.
+_keys_cache: tuple[Path, int, int, dict[str, Any]] | None = None
+
+
 def _load_keys() -> dict[str, Any]:
-    if not API_KEYS_PATH.exists():
+    global _keys_cache
+    try:
+        stat = API_KEYS_PATH.stat()
+    except FileNotFoundError:
         return {"keys": {}}
-    return json.loads(API_KEYS_PATH.read_text())
+
+    cached = _keys_cache
+    if cached is not None and cached[:3] == (API_KEYS_PATH, stat.st_mtime_ns, stat.st_size):
+        return cached[3]
+
+    data: dict[str, Any] = codec.loads(API_KEYS_PATH.read_bytes())
+    _keys_cache = (API_KEYS_PATH, stat.st_mtime_ns, stat.st_size, data)
+    return data
 
 
 def _save_keys(data: dict[str, Any]) -> None:
+    global _keys_cache
+    # Callers mutate the cached dict in place; drop it until the write lands so a failed
+    # save cannot leave the cache ahead of the file.
+    _keys_cache = None
     API_KEYS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    API_KEYS_PATH.write_text(json.dumps(data, indent=2, default=str))
+    API_KEYS_PATH.write_text(codec.dumps(data))
+    stat = API_KEYS_PATH.stat()
+    _keys_cache = (API_KEYS_PATH, stat.st_mtime_ns, stat.st_size, data)
 
 
 def generate_api_key(user_id: str, name: str = "default") -> APIKey:
@@ -71,10 +92,9 @@ def validate_api_key(key: str) -> APIKey | None:
 def list_api_keys(user_id: str | None = None) -> list[APIKey]:
     """List all API keys, optionally filtered by user_id."""
     data = _load_keys()
-    keys = [APIKey(**v) for v in data["keys"].values()]
-    if user_id:
-        keys = [k for k in keys if k.user_id == user_id]
-    return keys
+    return [
+        APIKey(**v) for v in data["keys"].values() if not user_id or v.get("user_id") == user_id
+    ]
 
 
 def revoke_api_key(key: str) -> bool:
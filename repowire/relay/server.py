@@ -9,6 +9,7 @@ import socketio
 from fastapi import FastAPI, Depends, HTTPException, Header
 from pydantic import BaseModel
 
+from repowire.protocol import codec
 from repowire.protocol.peers import Peer, PeerStatus
 from repowire.protocol.messages import Message, MessageType
 from repowire.relay.auth import validate_api_key, APIKey
@@ -26,7 +27,7 @@ peers: dict[str, PeerInfo] = {}
 user_peers: dict[str, dict[str, str]] = {}
 pending_responses: dict[str, str] = {}
 
-sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*", json=codec)
 app = FastAPI(title="Repowire Relay", version="0.1.0")
 socket_app = socketio.ASGIApp(sio, other_asgi_app=app)
 
@@ -50,10 +51,10 @@ async def health() -> dict[str, str]:
 
 @app.get("/api/v1/peers")
 async def list_peers_http(api_key: APIKey = Depends(get_api_key)) -> list[dict[str, Any]]:
-    user_id = api_key.user_id
-    if user_id not in user_peers:
+    user_targets = user_peers.get(api_key.user_id)
+    if not user_targets:
         return []
-    return [peers[sid].peer.to_dict() for sid in user_peers[user_id].values() if sid in peers]
+    return [peers[sid].peer.to_dict() for sid in user_targets.values() if sid in peers]
 
 
 @sio.event
@@ -76,18 +77,16 @@ async def connect(
 
 @sio.event
 async def disconnect(sid: str) -> None:
-    if sid not in peers:
+    peer_info = peers.pop(sid, None)
+    if peer_info is None:
         return
 
-    peer_info = peers[sid]
     user_id = peer_info.user_id
     peer_name = peer_info.peer.name
 
-    del peers[sid]
-    if user_id in user_peers and peer_name in user_peers[user_id]:
-        del user_peers[user_id][peer_name]
-        if not user_peers[user_id]:
-            del user_peers[user_id]
+    user_targets = user_peers.get(user_id)
+    if user_targets and user_targets.pop(peer_name, None) is not None and not user_targets:
+        del user_peers[user_id]
 
     await sio.emit(
         "peer_left",
@@ -114,9 +113,7 @@ async def register(sid: str, data: dict[str, Any]) -> dict[str, Any]:
     peer_info = PeerInfo(peer=peer, user_id=user_id, sid=sid)
     peers[sid] = peer_info
 
-    if user_id not in user_peers:
-        user_peers[user_id] = {}
-    user_peers[user_id][peer.name] = sid
+    user_peers.setdefault(user_id, {})[peer.name] = sid
 
     await sio.emit(
         "peer_joined",
@@ -130,16 +127,16 @@ async def register(sid: str, data: dict[str, Any]) -> dict[str, Any]:
 
 @sio.event
 async def unregister(sid: str) -> dict[str, str]:
-    if sid not in peers:
+    peer_info = peers.pop(sid, None)
+    if peer_info is None:
         return {"status": "not_registered"}
 
-    peer_info = peers[sid]
     user_id = peer_info.user_id
     peer_name = peer_info.peer.name
 
-    del peers[sid]
-    if user_id in user_peers and peer_name in user_peers[user_id]:
-        del user_peers[user_id][peer_name]
+    user_targets = user_peers.get(user_id)
+    if user_targets:
+        user_targets.pop(peer_name, None)
 
     await sio.emit(
         "peer_left",
@@ -153,21 +150,19 @@ async def unregister(sid: str) -> dict[str, str]:
 
 @sio.event
 async def message(sid: str, data: dict[str, Any]) -> dict[str, Any]:
-    if sid not in peers:
+    sender = peers.get(sid)
+    if sender is None:
         return {"error": "not_registered"}
 
-    sender = peers[sid]
-    user_id = sender.user_id
     target_name = data.get("to_peer")
-
     if not target_name:
         return {"error": "missing_target"}
 
-    if user_id not in user_peers or target_name not in user_peers[user_id]:
+    user_targets = user_peers.get(sender.user_id)
+    target_sid = user_targets.get(target_name) if user_targets else None
+    if target_sid is None:
         return {"error": "peer_not_found", "peer": target_name}
 
-    target_sid = user_peers[user_id][target_name]
-
     msg = Message(
         type=MessageType(data.get("type", "query")),
         from_peer=sender.peer.name,
@@ -190,16 +185,14 @@ async def response(sid: str, data: dict[str, Any]) -> dict[str, Any]:
     if not correlation_id:
         return {"error": "missing_correlation_id"}
 
-    if correlation_id not in pending_responses:
+    target_sid = pending_responses.pop(correlation_id, None)
+    if target_sid is None:
         return {"error": "no_pending_request"}
 
-    target_sid = pending_responses.pop(correlation_id)
-
-    if sid not in peers:
+    sender = peers.get(sid)
+    if sender is None:
         return {"error": "not_registered"}
 
-    sender = peers[sid]
-
     msg = Message(
         type=MessageType.RESPONSE,
         from_peer=sender.peer.name,
@@ -216,15 +209,12 @@ async def response(sid: str, data: dict[str, Any]) -> dict[str, Any]:
 @sio.event
 async def list_peers(sid: str) -> list[dict[str, Any]]:
     session = await sio.get_session(sid)
-    user_id = session["user_id"]
-
-    if user_id not in user_peers:
+    user_targets = user_peers.get(session["user_id"])
+    if not user_targets:
         return []
 
     return [
-        peers[peer_sid].peer.to_dict()
-        for peer_sid in user_peers[user_id].values()
-        if peer_sid in peers
+        peers[peer_sid].peer.to_dict() for peer_sid in user_targets.values() if peer_sid in peers
     ]
 
 
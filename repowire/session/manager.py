@@ -3,26 +3,37 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import contextlib
 import socket
 from datetime import datetime
 from pathlib import Path
-from uuid import uuid4
 
 import libtmux
 
-from repowire.config.models import Config, load_config
+from repowire.config.models import Config, PeerConfig, load_config
+from repowire.protocol import codec
+from repowire.protocol.messages import new_message_id
 from repowire.protocol.peers import Peer, PeerStatus
 
+MAX_RESPONSE_BYTES = 8 * 1024 * 1024
+
+
+def _expire_query(future: asyncio.Future[str], peer_name: str, timeout: float) -> None:
+    if not future.done():
+        future.set_exception(TimeoutError(f"No response from {peer_name} within {timeout}s"))
+
 
 class TmuxSessionManager:
     def __init__(self, config: Config | None = None) -> None:
         self.config = config or load_config()
         self.server = libtmux.Server()
         self.pending_dir = Path.home() / ".repowire" / "pending"
+        self.claude_projects_dir = Path.home() / ".claude" / "projects"
+        self.machine = socket.gethostname()
         self.socket_path = Path(self.config.daemon.socket_path)
 
         self._pending_futures: dict[str, asyncio.Future[str]] = {}
+        self._project_dirs: dict[str, Path] = {}
         self._socket_server: asyncio.Server | None = None
         self._running = False
 
@@ -55,23 +66,18 @@ class TmuxSessionManager:
         self._pending_futures.clear()
 
     def list_peers(self) -> list[Peer]:
-        peers = []
-        machine = socket.gethostname()
-
-        for name, peer_config in self.config.peers.items():
-            status = self._get_peer_status(peer_config.tmux_session)
-            peers.append(
-                Peer(
-                    name=name,
-                    path=peer_config.path,
-                    machine=machine,
-                    tmux_session=peer_config.tmux_session,
-                    status=status,
-                    last_seen=datetime.utcnow() if status != PeerStatus.OFFLINE else None,
-                )
+        online_sessions = self._get_online_sessions()
+
+        return [
+            self._build_peer(
+                name,
+                peer_config,
+                PeerStatus.ONLINE
+                if peer_config.tmux_session in online_sessions
+                else PeerStatus.OFFLINE,
             )
-
-        return peers
+            for name, peer_config in self.config.peers.items()
+        ]
 
     def get_peer(self, name: str) -> Peer | None:
         peer_config = self.config.peers.get(name)
@@ -79,10 +85,13 @@ class TmuxSessionManager:
             return None
 
         status = self._get_peer_status(peer_config.tmux_session)
+        return self._build_peer(name, peer_config, status)
+
+    def _build_peer(self, name: str, peer_config: PeerConfig, status: PeerStatus) -> Peer:
         return Peer(
             name=name,
             path=peer_config.path,
-            machine=socket.gethostname(),
+            machine=self.machine,
             tmux_session=peer_config.tmux_session,
             status=status,
             last_seen=datetime.utcnow() if status != PeerStatus.OFFLINE else None,
@@ -95,19 +104,10 @@ class TmuxSessionManager:
         from_peer: str = "repowire",
         timeout: float = 120.0,
     ) -> str:
-        peer = self.get_peer(peer_name)
-        if not peer:
-            raise ValueError(f"Unknown peer: {peer_name}")
-
-        if peer.status == PeerStatus.OFFLINE:
-            raise ValueError(f"Peer {peer_name} is offline")
-
-        pane = self._get_peer_pane(peer.tmux_session)
-        if not pane:
-            raise ValueError(f"Could not find pane for peer {peer_name}")
-
-        correlation_id = str(uuid4())
-        session_id = self._get_claude_session_id(peer.tmux_session)
+        # tmux lookups shell out and block, so keep them off the event loop.
+        peer, pane = await asyncio.to_thread(self._resolve_peer_pane, peer_name)
+        session_id = await asyncio.to_thread(self._get_claude_session_id, peer.tmux_session)
+        correlation_id = new_message_id()
 
         pending_file = self.pending_dir / f"{session_id or correlation_id}.json"
         pending_data = {
@@ -117,23 +117,28 @@ class TmuxSessionManager:
             "query": query,
             "timestamp": datetime.utcnow().isoformat(),
         }
-        pending_file.write_text(json.dumps(pending_data))
-
-        response_future: asyncio.Future[str] = asyncio.Future()
-        self._pending_futures[correlation_id] = response_future
 
-        formatted_query = f"@{from_peer} asks: {query}"
-        pane.send_keys(formatted_query, enter=True)
+        loop = asyncio.get_running_loop()
+        response_future: asyncio.Future[str] = loop.create_future()
+        timer: asyncio.TimerHandle | None = None
 
+        # Cover the send_keys await too: it can raise or be cancelled, and a stale pending
+        # file would hand the session's next reply to a dead correlation id.
         try:
-            response = await asyncio.wait_for(response_future, timeout=timeout)
-            return response
-        except asyncio.TimeoutError:
-            raise TimeoutError(f"No response from {peer_name} within {timeout}s")
+            pending_file.write_text(codec.dumps(pending_data))
+            self._pending_futures[correlation_id] = response_future
+
+            formatted_query = f"@{from_peer} asks: {query}"
+            await asyncio.to_thread(pane.send_keys, formatted_query, enter=True)
+
+            # Fail the future from a loop timer instead of wrapping it in asyncio.wait_for.
+            timer = loop.call_later(timeout, _expire_query, response_future, peer_name, timeout)
+            return await response_future
         finally:
+            if timer is not None:
+                timer.cancel()
             self._pending_futures.pop(correlation_id, None)
-            if pending_file.exists():
-                pending_file.unlink()
+            pending_file.unlink(missing_ok=True)
 
     async def send_notification(
         self,
@@ -141,6 +146,36 @@ class TmuxSessionManager:
         message: str,
         from_peer: str = "repowire",
     ) -> None:
+        _, pane = await asyncio.to_thread(self._resolve_peer_pane, peer_name)
+
+        formatted_message = f"@{from_peer} says: {message}"
+        await asyncio.to_thread(pane.send_keys, formatted_message, enter=True)
+
+    async def broadcast(self, message: str, from_peer: str = "repowire") -> list[str]:
+        formatted_message = f"@{from_peer} says: {message}"
+        return await asyncio.to_thread(self._broadcast_sync, formatted_message)
+
+    def _broadcast_sync(self, formatted_message: str) -> list[str]:
+        # Resolve sessions once for the whole fan-out rather than repeating
+        # send_notification's per-peer lookups.
+        sessions = self._get_online_sessions()
+
+        delivered = []
+        for name, peer_config in self.config.peers.items():
+            session = sessions.get(peer_config.tmux_session)
+            if session is None:
+                continue
+            try:
+                pane = session.active_pane
+                if pane is None:
+                    continue
+                pane.send_keys(formatted_message, enter=True)
+            except Exception:
+                continue
+            delivered.append(name)
+        return delivered
+
+    def _resolve_peer_pane(self, peer_name: str) -> tuple[Peer, libtmux.Pane]:
         peer = self.get_peer(peer_name)
         if not peer:
             raise ValueError(f"Unknown peer: {peer_name}")
@@ -152,16 +187,14 @@ class TmuxSessionManager:
         if not pane:
             raise ValueError(f"Could not find pane for peer {peer_name}")
 
-        formatted_message = f"@{from_peer} says: {message}"
-        pane.send_keys(formatted_message, enter=True)
+        return peer, pane
 
-    async def broadcast(self, message: str, from_peer: str = "repowire") -> None:
-        for peer in self.list_peers():
-            if peer.status != PeerStatus.OFFLINE:
-                try:
-                    await self.send_notification(peer.name, message, from_peer)
-                except Exception:
-                    pass
+    def _get_online_sessions(self) -> dict[str, libtmux.Session]:
+        # Every access to server.sessions shells out to tmux, so list them once per call.
+        try:
+            return {s.session_name: s for s in self.server.sessions if s.session_name}
+        except Exception:
+            return {}
 
     def _get_peer_status(self, tmux_session: str) -> PeerStatus:
         try:
@@ -195,23 +228,10 @@ class TmuxSessionManager:
             if not pane_path:
                 return None
 
-            claude_projects = Path.home() / ".claude" / "projects"
-            if not claude_projects.exists():
+            project_dir = self._find_project_dir(pane_path)
+            if project_dir is None:
                 return None
 
-            path_slug = pane_path.replace("/", "-")
-            if path_slug.startswith("-"):
-                path_slug = path_slug[1:]
-
-            project_dir = claude_projects / f"-{path_slug}"
-            if not project_dir.exists():
-                for candidate in claude_projects.iterdir():
-                    if candidate.is_dir() and path_slug in candidate.name:
-                        project_dir = candidate
-                        break
-                else:
-                    return None
-
             jsonl_files = sorted(
                 project_dir.glob("*.jsonl"), key=lambda p: p.stat().st_mtime, reverse=True
             )
@@ -222,17 +242,53 @@ class TmuxSessionManager:
         except Exception:
             return None
 
+    def _find_project_dir(self, pane_path: str) -> Path | None:
+        # Only successful lookups are cached; a project dir may appear once Claude starts.
+        project_dir = self._project_dirs.get(pane_path)
+        if project_dir is not None:
+            return project_dir
+
+        claude_projects = self.claude_projects_dir
+        if not claude_projects.exists():
+            return None
+
+        path_slug = pane_path.replace("/", "-")
+        if path_slug.startswith("-"):
+            path_slug = path_slug[1:]
+
+        project_dir = claude_projects / f"-{path_slug}"
+        if not project_dir.exists():
+            for candidate in claude_projects.iterdir():
+                if candidate.is_dir() and path_slug in candidate.name:
+                    project_dir = candidate
+                    break
+            else:
+                return None
+
+        self._project_dirs[pane_path] = project_dir
+        return project_dir
+
     async def _socket_handler(
         self,
         reader: asyncio.StreamReader,
         writer: asyncio.StreamWriter,
     ) -> None:
         try:
-            data = await reader.read(65536)
-            if not data:
+            # The hook closes its end after one sendall(), so read to EOF; a single fixed-size
+            # read truncated long responses. Anything past the cap is dropped, not buffered.
+            chunks = []
+            size = 0
+            while chunk := await reader.read(64 * 1024):
+                size += len(chunk)
+                if size > MAX_RESPONSE_BYTES:
+                    return
+                chunks.append(chunk)
+            if not chunks:
                 return
 
-            message = json.loads(data.decode())
+            data = b"".join(chunks)
+
+            message = codec.loads(data)
             correlation_id = message.get("correlation_id")
             response = message.get("response")
 
@@ -245,9 +301,11 @@ class TmuxSessionManager:
             pass
         finally:
             writer.close()
-            await writer.wait_closed()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
 
     def _handle_response(self, correlation_id: str, response: str) -> None:
-        future = self._pending_futures.get(correlation_id)
-        if future and not future.done():
+        # Popping hands the future to exactly one responder; a duplicate reply finds nothing.
+        future = self._pending_futures.pop(correlation_id, None)
+        if future is not None and not future.done():
             future.set_result(response)
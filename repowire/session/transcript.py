@@ -3,65 +3,89 @@
 from __future__ import annotations
 
 import json
+import os
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Any
+from typing import Any, BinaryIO
+
+CHUNK_SIZE = 64 * 1024
 
 
 def extract_last_assistant_response(transcript_path: Path) -> str | None:
     if not transcript_path.exists():
         return None
 
-    last_assistant_content: str | None = None
-
-    with open(transcript_path) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+    # Transcripts only grow, and the answer is near the end: scan backwards and stop at
+    # the first assistant entry with text instead of decoding the whole file.
+    with open(transcript_path, "rb") as f:
+        for line in _iter_lines_reversed(f):
+            # Most lines are user, tool or progress entries; only parse ones that can match.
+            if b'"assistant"' not in line:
                 continue
 
             try:
                 entry = json.loads(line)
-            except json.JSONDecodeError:
+            except ValueError:
                 continue
 
             if entry.get("type") != "assistant":
                 continue
 
-            message = entry.get("message", {})
-            if message.get("role") != "assistant":
+            message = entry.get("message")
+            if not isinstance(message, dict):
                 continue
 
-            content = message.get("content", [])
-            text = _extract_text_from_content(content)
+            text = _extract_text_from_content(message.get("content"))
             if text:
-                last_assistant_content = text
+                return text
 
-    return last_assistant_content
+    return None
 
 
-def _extract_text_from_content(content: Any) -> str | None:
-    if isinstance(content, str):
-        return content
+def _iter_lines_reversed(f: BinaryIO) -> Iterator[bytes]:
+    position = f.seek(0, os.SEEK_END)
+    # Pieces of the line being assembled, newest (rightmost) first; joined only once the
+    # line is complete so long lines are not re-copied on every chunk.
+    pieces: list[bytes] = []
+    while position > 0:
+        read_size = min(CHUNK_SIZE, position)
+        position -= read_size
+        f.seek(position)
+        chunk = f.read(read_size)
+        end = len(chunk)
+        newline = chunk.rfind(b"\n", 0, end)
+        while newline != -1:
+            pieces.append(chunk[newline + 1 : end])
+            yield b"".join(reversed(pieces))
+            pieces.clear()
+            end = newline
+            newline = chunk.rfind(b"\n", 0, end)
+        pieces.append(chunk[:end])
+    yield b"".join(reversed(pieces))
 
+
+def _extract_text_from_content(content: Any) -> str | None:
+    # Lists of content parts are by far the most common shape, so check them first.
     if isinstance(content, list):
-        texts = []
-        for item in content:
-            if isinstance(item, dict):
-                if item.get("type") == "text":
-                    text = item.get("text", "")
-                    if text:
-                        texts.append(text)
-            elif isinstance(item, str):
-                texts.append(item)
+        texts = [
+            item["text"] if isinstance(item, dict) else item
+            for item in content
+            if isinstance(item, str)
+            or (isinstance(item, dict) and item.get("type") == "text" and item.get("text"))
+        ]
         return " ".join(texts) if texts else None
 
+    if isinstance(content, str):
+        return content
+
     if isinstance(content, dict):
-        if content.get("type") == "text":
+        content_type = content.get("type")
+        if content_type == "text":
             return content.get("text")
-        if content.get("type") == "output":
-            data = content.get("data", {})
+        if content_type == "output":
+            data = content.get("data")
             if isinstance(data, dict):
-                inner_msg = data.get("message", {})
+                inner_msg = data.get("message")
                 if isinstance(inner_msg, dict):
                     return _extract_text_from_content(inner_msg.get("content"))
 
@@ -1,9 +1,5 @@
-import pytest
-from datetime import datetime
-
 from repowire.protocol.peers import Peer, PeerStatus
 from repowire.protocol.messages import (
-    Message,
     MessageType,
     QueryMessage,
     ResponseMessage,
@@ -108,9 +104,4 @@ class TestMessages:
             text="hello",
         )
 
-        data = msg.to_dict()
-        restored = Message.from_dict(data)
-
-        assert restored.id == msg.id
-        assert restored.type == msg.type
-        assert restored.from_peer == msg.from_peer
+        assert QueryMessage.from_dict(msg.to_dict()) == msg
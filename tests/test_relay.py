@@ -1,50 +1,79 @@
+import json
+
 import pytest
-import tempfile
-from pathlib import Path
-from unittest.mock import patch
 from datetime import datetime
 
-from repowire.relay.auth import generate_api_key, validate_api_key, APIKey
+from repowire.relay.auth import generate_api_key, revoke_api_key, validate_api_key, APIKey
+
+
+@pytest.fixture
+def keys_file(tmp_path, monkeypatch):
+    path = tmp_path / "api_keys.json"
+    monkeypatch.setattr("repowire.relay.auth.API_KEYS_PATH", path)
+    return path
 
 
 class TestRelayAuth:
-    def test_generate_api_key(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            keys_file = Path(tmpdir) / "api_keys.json"
-            with patch("repowire.relay.auth.API_KEYS_PATH", keys_file):
-                api_key = generate_api_key("user1", "test-key")
-
-                assert api_key.key.startswith("rw_")
-                assert api_key.user_id == "user1"
-                assert api_key.name == "test-key"
-                assert keys_file.exists()
-
-    def test_validate_api_key(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            keys_file = Path(tmpdir) / "api_keys.json"
-            with patch("repowire.relay.auth.API_KEYS_PATH", keys_file):
-                generated = generate_api_key("user1", "test")
-
-                validated = validate_api_key(generated.key)
-
-                assert validated is not None
-                assert validated.user_id == "user1"
-                assert validated.key == generated.key
-
-    def test_validate_invalid_key(self):
-        with tempfile.TemporaryDirectory() as tmpdir:
-            keys_file = Path(tmpdir) / "api_keys.json"
-            with patch("repowire.relay.auth.API_KEYS_PATH", keys_file):
-                result = validate_api_key("rw_invalid_key")
-                assert result is None
+    def test_generate_api_key(self, keys_file):
+        api_key = generate_api_key("user1", "test-key")
+
+        assert api_key.key.startswith("rw_")
+        assert api_key.user_id == "user1"
+        assert api_key.name == "test-key"
+        assert keys_file.exists()
+
+    def test_validate_api_key(self, keys_file):
+        generated = generate_api_key("user1", "test")
+
+        validated = validate_api_key(generated.key)
+
+        assert validated is not None
+        assert validated.user_id == "user1"
+        assert validated.key == generated.key
+
+    def test_validate_invalid_key(self, keys_file):
+        result = validate_api_key("rw_invalid_key")
+        assert result is None
+
+    def test_external_edit_is_picked_up(self, keys_file):
+        generated = generate_api_key("user1", "test")
+        assert validate_api_key(generated.key) is not None
+
+        keys_file.write_text(json.dumps({"keys": {}}))
+
+        assert validate_api_key(generated.key) is None
+
+    def test_cache_refreshed_after_save(self, keys_file):
+        first = generate_api_key("user1", "first")
+        second = generate_api_key("user1", "second")
+
+        assert validate_api_key(first.key) is not None
+        assert validate_api_key(second.key) is not None
+        assert set(json.loads(keys_file.read_text())["keys"]) == {first.key, second.key}
+
+    def test_failed_save_leaves_no_stale_cache(self, keys_file, monkeypatch):
+        generated = generate_api_key("user1", "test")
+
+        def fail(*args, **kwargs):
+            raise OSError("disk full")
+
+        with monkeypatch.context() as m:
+            m.setattr(type(keys_file), "write_text", fail)
+            with pytest.raises(OSError):
+                revoke_api_key(generated.key)
+
+        assert generated.key in json.loads(keys_file.read_text())["keys"]
+        assert validate_api_key(generated.key) is not None
 
     def test_api_key_model(self):
+        created_at = datetime(2024, 1, 1)
         key = APIKey(
             key="rw_test123",
             user_id="user1",
             name="test",
-            created_at=datetime.utcnow(),
+            created_at=created_at,
         )
 
         assert key.key == "rw_test123"
+        assert key.created_at == created_at
         assert key.last_used is None
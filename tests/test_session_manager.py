@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import pytest
+
+from repowire.config.models import Config
+from repowire.session import manager as manager_module
+from repowire.session.manager import TmuxSessionManager
+
+
+@pytest.fixture
+async def session_manager(tmp_path):
+    config = Config()
+    config.daemon.socket_path = str(tmp_path / "repowire.sock")
+    mgr = TmuxSessionManager(config)
+    mgr.pending_dir = tmp_path / "pending"
+
+    await mgr.start()
+    yield mgr
+    await mgr.stop()
+
+
+async def _send(socket_path, payload):
+    reader, writer = await asyncio.open_unix_connection(str(socket_path))
+    writer.write(payload)
+    writer.write_eof()
+    reply = await reader.read()
+    writer.close()
+    await writer.wait_closed()
+    return reply
+
+
+class TestSocketHandler:
+    async def test_response_larger_than_one_read(self, session_manager):
+        future = asyncio.get_running_loop().create_future()
+        session_manager._pending_futures["abc123"] = future
+        response = "x" * (256 * 1024)
+
+        payload = json.dumps({"correlation_id": "abc123", "response": response})
+        reply = await _send(session_manager.socket_path, payload.encode())
+
+        assert json.loads(reply) == {"status": "ok"}
+        assert await asyncio.wait_for(future, 1) == response
+
+    async def test_oversized_payload_is_dropped(self, session_manager, monkeypatch):
+        monkeypatch.setattr(manager_module, "MAX_RESPONSE_BYTES", 1024)
+        future = asyncio.get_running_loop().create_future()
+        session_manager._pending_futures["abc123"] = future
+
+        payload = json.dumps({"correlation_id": "abc123", "response": "x" * 4096})
+        reply = await _send(session_manager.socket_path, payload.encode())
+
+        assert reply == b""
+        assert not future.done()
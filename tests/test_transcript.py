@@ -1,95 +1,149 @@
-import pytest
-import tempfile
 import json
 from pathlib import Path
 
+import pytest
+
+from repowire.hooks import stop_handler
+from repowire.session import transcript
 from repowire.session.transcript import extract_last_assistant_response
 
 
+def _user(content):
+    return {"type": "user", "message": {"content": content}}
+
+
+def _assistant(content):
+    return {"type": "assistant", "message": {"content": content}}
+
+
+def _text(text):
+    return [{"type": "text", "text": text}]
+
+
+def _dumps(entry):
+    return json.dumps(entry, separators=(",", ":"))
+
+
+def _write_jsonl(path, *entries):
+    path.write_text("".join(_dumps(e) + "\n" for e in entries))
+    return path
+
+
+class _CountingJson:
+    def __init__(self):
+        self.calls = 0
+
+    def loads(self, s):
+        self.calls += 1
+        return json.loads(s)
+
+
 class TestTranscriptParser:
-    def test_extract_text_content(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
-            f.write(json.dumps({"type": "user", "message": {"content": "Hello"}}) + "\n")
-            f.write(
-                json.dumps(
-                    {
-                        "type": "assistant",
-                        "message": {
-                            "content": [{"type": "text", "text": "Hello! How can I help?"}]
-                        },
-                    }
-                )
-                + "\n"
-            )
-            path = Path(f.name)
+    def test_extract_text_content(self, tmp_path):
+        path = _write_jsonl(
+            tmp_path / "transcript.jsonl",
+            _user("Hello"),
+            _assistant(_text("Hello! How can I help?")),
+        )
 
         result = extract_last_assistant_response(path)
         assert result == "Hello! How can I help?"
 
-        path.unlink()
-
-    def test_extract_multiple_messages(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
-            f.write(
-                json.dumps(
-                    {
-                        "type": "assistant",
-                        "message": {"content": [{"type": "text", "text": "First response"}]},
-                    }
-                )
-                + "\n"
-            )
-            f.write(json.dumps({"type": "user", "message": {"content": "Follow up"}}) + "\n")
-            f.write(
-                json.dumps(
-                    {
-                        "type": "assistant",
-                        "message": {"content": [{"type": "text", "text": "Second response"}]},
-                    }
-                )
-                + "\n"
-            )
-            path = Path(f.name)
+    def test_extract_multiple_messages(self, tmp_path):
+        path = _write_jsonl(
+            tmp_path / "transcript.jsonl",
+            _assistant(_text("First response")),
+            _user("Follow up"),
+            _assistant(_text("Second response")),
+        )
 
         result = extract_last_assistant_response(path)
         assert result == "Second response"
 
-        path.unlink()
-
-    def test_extract_string_content(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
-            f.write(
-                json.dumps({"type": "assistant", "message": {"content": "Direct string content"}})
-                + "\n"
-            )
-            path = Path(f.name)
+    def test_extract_string_content(self, tmp_path):
+        path = _write_jsonl(
+            tmp_path / "transcript.jsonl",
+            _assistant("Direct string content"),
+        )
 
         result = extract_last_assistant_response(path)
         assert result == "Direct string content"
 
-        path.unlink()
-
     def test_nonexistent_file(self):
         result = extract_last_assistant_response(Path("/nonexistent/path.jsonl"))
         assert result is None
 
-    def test_empty_file(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
-            path = Path(f.name)
+    def test_empty_file(self, tmp_path):
+        path = _write_jsonl(tmp_path / "transcript.jsonl")
 
         result = extract_last_assistant_response(path)
         assert result is None
 
-        path.unlink()
-
-    def test_no_assistant_messages(self):
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
-            f.write(
-                json.dumps({"type": "user", "message": {"content": "Only user messages"}}) + "\n"
-            )
-            path = Path(f.name)
+    def test_no_assistant_messages(self, tmp_path):
+        path = _write_jsonl(
+            tmp_path / "transcript.jsonl",
+            _user("Only user messages"),
+        )
 
         result = extract_last_assistant_response(path)
         assert result is None
 
-        path.unlink()
+    def test_reverse_scan_stops_early(self, tmp_path, monkeypatch):
+        earlier = [_assistant(_text(f"Old response {i}")) for i in range(1000)]
+        path = _write_jsonl(
+            tmp_path / "transcript.jsonl", *earlier, _assistant(_text("Latest response"))
+        )
+
+        counting_json = _CountingJson()
+        monkeypatch.setattr(transcript, "json", counting_json)
+
+        result = extract_last_assistant_response(path)
+        assert result == "Latest response"
+        assert counting_json.calls == 1
+
+
+# The stop hook carries its own copy of the reverse scanner, so run both through it.
+@pytest.fixture(params=[transcript, stop_handler], ids=["transcript", "stop_handler"])
+def parser(request, monkeypatch):
+    monkeypatch.setattr(request.param, "CHUNK_SIZE", 16)
+    return request.param
+
+
+class TestReverseScan:
+    def test_lines_spanning_chunks(self, tmp_path, parser):
+        path = _write_jsonl(
+            tmp_path / "transcript.jsonl",
+            _assistant(_text("First response")),
+            _user("Follow up"),
+            _assistant(_text("Second response")),
+        )
+
+        result = parser.extract_last_assistant_response(path)
+        assert result == "Second response"
+
+    def test_no_trailing_newline(self, tmp_path, parser):
+        path = tmp_path / "transcript.jsonl"
+        path.write_text(_dumps(_user("Hello")) + "\n" + _dumps(_assistant(_text("No newline"))))
+
+        result = parser.extract_last_assistant_response(path)
+        assert result == "No newline"
+
+    def test_crlf_line_endings(self, tmp_path, parser):
+        path = tmp_path / "transcript.jsonl"
+        entries = [_assistant(_text("Earlier")), _assistant(_text("Windows")), _user("Bye")]
+        path.write_bytes("".join(_dumps(e) + "\r\n" for e in entries).encode())
+
+        result = parser.extract_last_assistant_response(path)
+        assert result == "Windows"
+
+    def test_line_much_longer_than_chunk(self, tmp_path, parser):
+        long_text = "x" * 5000
+        path = _write_jsonl(
+            tmp_path / "transcript.jsonl",
+            _assistant(_text("Earlier")),
+            _assistant(_text(long_text)),
+            _user("y" * 5000),
+        )
+
+        result = parser.extract_last_assistant_response(path)
+        assert result == long_text